@@ -11,6 +11,7 @@ setup(
     entry_points={
         "console_scripts": [
             "web4x-browser=web4x_browser.main:main",  # Command to run the app
+            "web4x-devtools=web4x_browser.devtools_client:main",  # Profiling client
         ]
     },
     author="Hannes Nortjé",
@@ -0,0 +1,145 @@
+"""
+Throughput benchmark for the page-to-Python bridge.
+
+Sends the same payloads from a page to Python over the default QWebChannel
+transport, over QWebChannel on the WebSocket bridge, and as binary bulk frames
+on the WebSocket bridge, then prints MB/s and messages/s for each.
+
+    python web4x_browser/bridge_benchmark.py --count 200 --sizes 1024 65536 1048576
+"""
+
+import argparse
+import os
+import sys
+import time
+from PyQt6.QtCore import QObject, QTimer, QUrl, pyqtSlot
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtWebEngineWidgets import QWebEngineView
+from PyQt6.QtWebChannel import QWebChannel
+
+# Sibling modules are imported by name, as browser.py does
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from websocket_transport import WebSocketBridgeServer
+
+# Constants
+JS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "js")
+DEFAULT_COUNT = 200
+DEFAULT_SIZES = [1024, 64 * 1024, 1024 * 1024]
+POLL_INTERVAL = 200
+TIMEOUT = 300
+
+BENCHMARK_JS = """
+(async function() {
+    const waitFor = (check) => new Promise((resolve) => {
+        const timer = setInterval(() => { if (check()) { clearInterval(timer); resolve(); } }, 10);
+    });
+    await waitFor(() => window.web4xChannel && window.web4xBulk);
+    const native = await new Promise((resolve) => new QWebChannel(qt.webChannelTransport, resolve));
+    const results = [];
+
+    async function run(transport, size, send) {
+        const start = performance.now();
+        for (let i = 0; i < %(count)d; i++) {
+            await send();
+        }
+        results.push({ transport: transport, size: size, seconds: (performance.now() - start) / 1000 });
+    }
+
+    for (const size of %(sizes)s) {
+        const text = 'x'.repeat(size);
+        const bytes = new Uint8Array(size);
+        await run('qwebchannel', size, () => new Promise((resolve) => native.objects.sink.receive(text, resolve)));
+        await run('websocket-json', size, () => new Promise((resolve) => window.web4xChannel.objects.sink.receive(text, resolve)));
+        await run('websocket-binary', size, () => window.web4xBulk.request('sink', {}, bytes));
+    }
+    window.__benchmarkResults = results;
+})();
+"""
+
+
+class BenchmarkSink(QObject):
+    @pyqtSlot(str, result=int)
+    def receive(self, payload: str) -> int:
+        return len(payload)
+
+
+class BridgeBenchmark(QObject):
+    def __init__(self, count: int, sizes: list) -> None:
+        super().__init__()
+        self.count = count
+        self.sizes = sizes
+        self.started = time.monotonic()
+
+        self.sink = BenchmarkSink()
+        self.channel = QWebChannel()
+        self.channel.registerObject("sink", self.sink)
+
+        self.server = WebSocketBridgeServer(self.channel, self)
+        if not self.server.listen():
+            raise RuntimeError("WebSocket bridge could not listen on localhost")
+        self.server.register_bulk_handler("sink", lambda args, payload: len(payload).to_bytes(8, "big"))
+
+        self.view = QWebEngineView()
+        self.view.page().setWebChannel(self.channel)
+        self.view.page().loadFinished.connect(self.start)
+        self.view.setHtml("<html><body>Bridge benchmark</body></html>", QUrl("http://localhost/"))
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll)
+
+    def start(self, ok: bool) -> None:
+        if not ok:
+            print("Benchmark page failed to load")
+            QApplication.quit()
+            return
+
+        with open(os.path.join(JS_DIR, "qwebchannel.js"), 'r') as file:
+            qwebchannel_js = file.read()
+        with open(os.path.join(JS_DIR, "browser_functions.js"), 'r') as file:
+            browser_functions_js = file.read()
+
+        script = f"""
+            window.__web4xBridge = {self.server.client_config(self.view, self.view.url())};
+            {qwebchannel_js}
+            {browser_functions_js}
+            {BENCHMARK_JS % {"count": self.count, "sizes": self.sizes}}
+        """
+        self.view.page().runJavaScript(script)
+        self.poll_timer.start(POLL_INTERVAL)
+
+    def poll(self) -> None:
+        if time.monotonic() - self.started > TIMEOUT:
+            print("Benchmark timed out")
+            QApplication.quit()
+            return
+        self.view.page().runJavaScript("window.__benchmarkResults || null", self.report)
+
+    def report(self, results: object) -> None:
+        if not results:
+            return
+        self.poll_timer.stop()
+
+        print(f"{'transport':<18}{'size':>10}{'MB/s':>12}{'msgs/s':>12}")
+        for result in results:
+            size = int(result["size"])
+            seconds = max(result["seconds"], 1e-9)
+            megabytes = size * self.count / (1024 * 1024)
+            print(f"{result['transport']:<18}{size:>10}{megabytes / seconds:>12.2f}{self.count / seconds:>12.0f}")
+        self.server.close()
+        QApplication.quit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare QWebChannel and WebSocket bridge throughput.")
+    parser.add_argument("--count", type=int, default=DEFAULT_COUNT, help="Messages sent per transport and size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Payload sizes in bytes")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication(sys.argv[:1])
+    benchmark = BridgeBenchmark(args.count, args.sizes)
+    app.exec()
+
+
+if __name__ == "__main__":
+    main()
@@ -36,6 +36,7 @@
  */
 """
 
+import json
 import sys
 from PyQt6.QtCore import (
     QUrl,
@@ -77,6 +78,17 @@ from collections import defaultdict
 import typing
 import os
 from file_system_handler import FileSystemHandler
+from url_index import UrlIndex
+from url_completer import UrlCompleter
+from tab_scheduler import FreezePolicy, TabScheduler, create_socket_counter_script
+from script_fanout import FanOutPolicy, ScriptFanOut, DEFAULT_TIMEOUT as FAN_OUT_TIMEOUT
+import tracing
+from websocket_transport import (
+    WebSocketBridgeServer,
+    SETTINGS_GROUP as BRIDGE_SETTINGS_GROUP,
+    TRANSPORT_QWEBCHANNEL,
+    TRANSPORT_WEBSOCKET,
+)
 from functools import partial
 
 # Constants
@@ -124,8 +136,8 @@ class CodeExecutor(QObject):
 
     @pyqtSlot(QVariant)
     def executeSignal(self, incoming):
-        print(f"Received from JavaScript: {incoming}")
-        self.codeResultReady.emit(incoming)
+        with tracing.span("executeSignal", "bridge", at_level=tracing.DEBUG, type=type(incoming).__name__):
+            self.codeResultReady.emit(incoming)
 
 class DevToolsWindow(QMainWindow):
     def __init__(self, parent: typing.Optional[QWidget] = None) -> None:
@@ -276,15 +288,33 @@ class Browser(QMainWindow):
         self.channel = QWebChannel()
         self.code_executor = CodeExecutor()
         self.file_system_handler = FileSystemHandler()
+        self.trace_collector = tracing.TraceCollector()
         self.channel.registerObject("codeExecutor", self.code_executor)
         self.channel.registerObject("fileSystemHandler", self.file_system_handler)
+        self.channel.registerObject("tracer", self.trace_collector)
         self.file_system_handler.fileRead.connect(self.handle_file_read)
+        self.bridge_server = self.setup_bridge_server()
 
         self.dev_tools_window = DevToolsWindow(self)
         self.dev_tools_window.hide()
 
+        self.tab_scheduler = TabScheduler(self.tabs, FreezePolicy.from_settings(self.settings), self)
+        self.socket_counter_script = create_socket_counter_script()
+        self.cpu_saved_label = QLabel()
+        self.statusBar().addPermanentWidget(self.cpu_saved_label)
+        self.tab_scheduler.statsChanged.connect(self.update_cpu_saved_label)
+
+        # Frozen tabs would never answer, so wake each one before dispatching to it
+        self.script_fan_out = ScriptFanOut(
+            self.tabs, FanOutPolicy.from_settings(self.settings), self.tab_scheduler.wake, self
+        )
+        self.channel.registerObject("scriptFanOut", self.script_fan_out)
+
         self.history: typing.List[typing.Tuple[QDateTime, str]] = []
         self.recently_closed: typing.List[str] = []
+        self.url_index = UrlIndex()
+        self.url_completer = UrlCompleter(self.url_index, self.open_tab_urls, self.url_bar)
+        self.url_completer.activated[str].connect(self.navigate_to_completion)
 
         self.zoom_level = 1.0
 
@@ -301,6 +331,26 @@ class Browser(QMainWindow):
 
         self.code_executor.codeResultReady.connect(self.open_new_tab)
 
+    def setup_bridge_server(self) -> typing.Optional[WebSocketBridgeServer]:
+        """Starts the loopback WebSocket transport when 'bridge/transport' is set to 'websocket'."""
+        transport = self.settings.value(f"{BRIDGE_SETTINGS_GROUP}/transport", TRANSPORT_QWEBCHANNEL)
+        if transport != TRANSPORT_WEBSOCKET:
+            return None
+
+        server = WebSocketBridgeServer(self.channel, self)
+        port = self.settings.value(f"{BRIDGE_SETTINGS_GROUP}/port", 0, type=int)
+        if not server.listen(port):
+            print(f"WebSocket bridge could not listen on port {port}, using QWebChannel transport")
+            return None
+
+        server.register_bulk_handler(
+            "readFile", lambda args, payload: self.file_system_handler.read_bytes(args["path"])
+        )
+        server.register_bulk_handler(
+            "writeFile", lambda args, payload: self.file_system_handler.write_bytes(args["path"], payload)
+        )
+        return server
+
     @pyqtSlot(QVariant)
     def open_new_tab(self, url: QVariant) -> None:
         """Opens a new tab with the given URL."""
@@ -337,6 +387,7 @@ class Browser(QMainWindow):
         three_dot_menu = QMenu("More", self)
         self.setup_history_menu(three_dot_menu)
         self.setup_zoom_menu(three_dot_menu)
+        self.add_action_to_menu(three_dot_menu, "Save Trace...", self.save_trace)
 
         three_dot_button = QAction("⋮", self)
         three_dot_button.triggered.connect(lambda: three_dot_menu.exec(QCursor.pos()))
@@ -415,6 +466,23 @@ class Browser(QMainWindow):
         if self.current_browser():
             self.current_browser().setUrl(url)
 
+    def navigate_to_completion(self, url_text: str) -> None:
+        for i in range(self.tabs.count()):
+            widget = self.tabs.widget(i)
+            if isinstance(widget, BrowserTab) and widget.browser.url().toString() == url_text:
+                self.tabs.setCurrentIndex(i)
+                return
+        self.url_bar.setText(url_text)
+        self.navigate_to_url()
+
+    def open_tab_urls(self) -> typing.List[typing.Tuple[str, str]]:
+        open_tabs = []
+        for i in range(self.tabs.count()):
+            widget = self.tabs.widget(i)
+            if isinstance(widget, BrowserTab):
+                open_tabs.append((widget.browser.url().toString(), self.tabs.tabText(i)))
+        return open_tabs
+
     def update_url_bar(self) -> None:
         current_browser = self.current_browser()
         if current_browser:
@@ -423,17 +491,23 @@ class Browser(QMainWindow):
             self.url_bar.clear()
 
     def add_new_tab(self, url: QUrl, title: str = "New Tab") -> None:
+        with tracing.span("add_new_tab", "tab", url=url.toString()):
+            self.create_tab(url, title)
+
+    def create_tab(self, url: QUrl, title: str) -> None:
         new_tab = BrowserTab(url.toString(), self)
 
         # Connect signals
         page = new_tab.browser.page()
         # Set the web channel before anything else
         page.setWebChannel(self.channel)
+        page.scripts().insert(self.socket_counter_script)
 
         # Connect other signals
         new_tab.browser.titleChanged.connect(lambda title, tab=new_tab: self.update_tab_title(tab, title))
         new_tab.browser.urlChanged.connect(self.update_url_bar)
-        new_tab.content_loaded.connect(self.record_history)
+        # titleChanged fires before the load finishes, when a first visit has no index entry yet
+        new_tab.content_loaded.connect(lambda url, tab=new_tab: self.record_history(url, tab.browser.title()))
         new_tab.browser.urlChanged.connect(self.update_navigation_actions)
 
         # Setup context menu
@@ -441,6 +515,7 @@ class Browser(QMainWindow):
         new_tab.browser.customContextMenuRequested.connect(self.open_context_menu)
 
         # Add tab
+        self.tab_scheduler.register_tab(new_tab)
         index = self.tabs.addTab(new_tab, title)
         self.tabs.setCurrentIndex(index)
 
@@ -451,6 +526,10 @@ class Browser(QMainWindow):
         closed_tab = self.tabs.widget(index)
         if isinstance(closed_tab, BrowserTab):
             self.recently_closed.append(closed_tab.browser.url().toString())
+            self.tab_scheduler.unregister_tab(closed_tab)
+            self.script_fan_out.tab_closed(closed_tab)
+            if self.bridge_server:
+                self.bridge_server.revoke(closed_tab)
         self.tabs.removeTab(index)
         closed_tab.deleteLater()  # Clean up the tab
 
@@ -458,6 +537,7 @@ class Browser(QMainWindow):
         index = self.tabs.indexOf(tab)
         if index != -1:
             self.tabs.setTabText(index, title)
+        self.url_index.set_title(tab.browser.url().toString(), title)
 
     def open_context_menu(self, position: typing.Any) -> None:
         menu = QMenu()
@@ -499,6 +579,21 @@ class Browser(QMainWindow):
         if browser:
             browser.page().runJavaScript(script)
 
+    def run_in_tabs(
+        self,
+        script: str,
+        selector: typing.Any = None,
+        timeout: int = FAN_OUT_TIMEOUT,
+        on_result: typing.Optional[typing.Callable[[dict], None]] = None,
+        on_finished: typing.Optional[typing.Callable[[list], None]] = None,
+    ) -> None:
+        """
+        Runs script in every tab matched by selector (see ScriptFanOut.select_tabs)
+        concurrently. The script is a function body and must 'return' its result.
+        """
+        tabs = self.script_fan_out.select_tabs(selector)
+        self.script_fan_out.run(script, tabs, timeout, on_result, on_finished)
+
     def save_as(self) -> None:
         page = self.current_browser().page()
         file_name, _ = QFileDialog.getSaveFileName(
@@ -550,11 +645,14 @@ class Browser(QMainWindow):
             self.dev_tools_window.show()
             self.current_browser().page().setDevToolsPage(self.dev_tools_window.dev_tools_view.page())
 
-    def record_history(self, url: str) -> None:
+    def record_history(self, url: str, title: str = "") -> None:
         timestamp = QDateTime.currentDateTime()
         self.history.append((timestamp, url))
         if len(self.history) > MAX_HISTORY_LENGTH:
             self.history.pop(0)
+        self.url_index.record_visit(url)
+        if title:
+            self.url_index.set_title(url, title)
 
     def open_all_history_tab(self) -> None:
         history_data = defaultdict(list)
@@ -617,7 +715,16 @@ class Browser(QMainWindow):
     def update_zoom_label(self) -> None:
         self.zoom_label_action.setText(f"Zoom: {self.zoom_level * 100:.0f}%")
 
+    def update_cpu_saved_label(self, frozen_count: int, saved_seconds: float) -> None:
+        if frozen_count == 0 and saved_seconds == 0:
+            self.cpu_saved_label.clear()
+        else:
+            self.cpu_saved_label.setText(f"Frozen tabs: {frozen_count} | CPU saved: {saved_seconds:.1f}s")
+
     def inject_javascript(self, tab: BrowserTab) -> None:
+        page = tab.browser.page()
+        injection = tracing.span("inject_javascript", "injection", url=tab.browser.url().toString()).begin()
+
         # Load browser functions JavaScript code from file
         browser_functions_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "js", "browser_functions.js")
         with open(browser_functions_path, 'r') as file:
@@ -625,6 +732,15 @@ class Browser(QMainWindow):
 
         # Inject both scripts
         script = f"""
+            // Trace settings for the injected tracer
+            window.__web4xTraceConfig = {{ level: {tracing.level()}, pid: {page.renderProcessPid()} }};
+
+            // Address of the WebSocket bridge, if enabled
+            window.__web4xBridge = {self.bridge_server.client_config(tab, tab.browser.url()) if self.bridge_server else "null"};
+
+            // Lets runInTabs identify this page, for trusted origins only
+            window.__web4xFanOutToken = {json.dumps(self.script_fan_out.page_token(tab))};
+
             // Inject QWebChannel.js
             {self.qwebchannel_js}
             
@@ -633,13 +749,22 @@ class Browser(QMainWindow):
         """
         
         def check_initialization(result):
-            print("JavaScript injection result:", result)
+            injection.set("result", repr(result))
+            injection.finish()
             
-        tab.browser.page().runJavaScript(script, check_initialization)
+        page.runJavaScript(script, check_initialization)
+
+    def save_trace(self) -> None:
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Save Trace", "trace.json", "Chrome Trace (*.json);;All Files (*)"
+        )
+        if file_name:
+            count = tracing.dump(file_name)
+            self.statusBar().showMessage(f"Saved {count} trace events to {file_name}", 5000)
 
     @pyqtSlot(str, str)
     def handle_file_read(self, filePath: str, content: str) -> None:
-        print(f"File {filePath} read successfully. Content: {content}")
+        tracing.instant("fileRead", "file_io", at_level=tracing.DEBUG, path=filePath, bytes=len(content))
         # You can add logic here to pass the content back to the web page, e.g., using runJavaScript
         script = f"""
             (function(filePath, content) {{
@@ -663,6 +788,9 @@ class Browser(QMainWindow):
             if isinstance(widget, BrowserTab):
                 open_tabs.append(widget.browser.url().toString())
         self.settings.setValue("openTabs", open_tabs)
+        trace_file = os.environ.get(tracing.TRACE_FILE_ENV)
+        if trace_file and tracing.enabled():
+            tracing.dump(trace_file)
         event.accept()
 
 
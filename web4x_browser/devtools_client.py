@@ -0,0 +1,233 @@
+"""
+Command line DevTools-protocol client for profiling Web4x Browser tabs.
+
+Start the browser with --remote-debugging-port, then record from another shell:
+
+    web4x-devtools --port 9222 --tab dashboard cpu-profile --duration 10
+    web4x-devtools --port 9222 --repeat 6 --interval 300 heap-snapshot
+    web4x-devtools --port 9222 metrics
+
+Files are written in the formats the Chrome DevTools Performance and Memory
+panels load directly (.cpuprofile, .heapsnapshot); metrics are written as JSON.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import typing
+import urllib.request
+from PyQt6.QtCore import QCoreApplication, QEventLoop, QObject, QTimer, QUrl
+from PyQt6.QtWebSockets import QWebSocket
+
+# Constants
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9222
+REMOTE_DEBUGGING_ENV = "QTWEBENGINE_REMOTE_DEBUGGING"
+COMMAND_TIMEOUT = 120000  # Milliseconds; heap snapshots of large pages take a while
+POLL_INTERVAL = 100  # Milliseconds between checks while waiting
+
+
+class DevToolsError(Exception):
+    pass
+
+
+def enable_remote_debugging(port: int) -> None:
+    """Exposes the DevTools endpoint on loopback only. Must run before QApplication is created."""
+    os.environ[REMOTE_DEBUGGING_ENV] = f"{DEFAULT_HOST}:{port}"
+
+
+def list_targets(port: int, host: str = DEFAULT_HOST) -> typing.List[dict]:
+    """Returns the page targets reported by the remote-debugging endpoint."""
+    try:
+        with urllib.request.urlopen(f"http://{host}:{port}/json/list", timeout=5) as response:
+            targets = json.loads(response.read().decode("utf-8"))
+    except OSError as e:
+        raise DevToolsError(f"No DevTools endpoint on {host}:{port}: {e}")
+    return [target for target in targets if target.get("type") == "page"]
+
+
+def find_target(targets: typing.List[dict], selector: typing.Optional[str]) -> dict:
+    """Picks a target by index, id, or URL/title substring; the first page when selector is None."""
+    if not targets:
+        raise DevToolsError("No page targets are open")
+    if selector is None:
+        return targets[0]
+    if selector.isdigit() and int(selector) < len(targets):
+        return targets[int(selector)]
+    for target in targets:
+        if selector == target.get("id") or selector in target.get("url", "") or selector in target.get("title", ""):
+            return target
+    raise DevToolsError(f"No page target matches '{selector}'")
+
+
+class DevToolsSession(QObject):
+    """
+    Synchronous DevTools-protocol session over one target's WebSocket.
+
+    Each command spins a local event loop until its response arrives, which keeps
+    the recording steps below straight-line code. Events are handed to listeners
+    registered with on_event().
+    """
+
+    def __init__(self, websocket_url: str, parent: typing.Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.next_id = 1
+        self.responses: typing.Dict[int, dict] = {}
+        self.listeners: typing.Dict[str, typing.List[typing.Callable[[dict], None]]] = {}
+        self.loop = QEventLoop(self)
+        self.closed = False
+
+        self.socket = QWebSocket()
+        self.socket.textMessageReceived.connect(self.on_message)
+        self.socket.connected.connect(self.loop.quit)
+        self.socket.disconnected.connect(self.on_disconnected)
+        self.socket.errorOccurred.connect(self.on_disconnected)
+        self.socket.open(QUrl(websocket_url))
+        self.wait(self.socket.isValid, "Could not connect to DevTools target")
+
+    def close(self) -> None:
+        self.socket.close()
+
+    def on_disconnected(self, *args: typing.Any) -> None:
+        self.closed = True
+        self.loop.quit()
+
+    def on_event(self, method: str, listener: typing.Callable[[dict], None]) -> None:
+        self.listeners.setdefault(method, []).append(listener)
+
+    def on_message(self, text: str) -> None:
+        message = json.loads(text)
+        if "id" in message:
+            self.responses[message["id"]] = message
+            self.loop.quit()
+        else:
+            for listener in self.listeners.get(message.get("method"), []):
+                listener(message.get("params", {}))
+
+    def send(self, method: str, params: typing.Optional[dict] = None) -> dict:
+        command_id = self.next_id
+        self.next_id += 1
+        self.socket.sendTextMessage(json.dumps({"id": command_id, "method": method, "params": params or {}}))
+        self.wait(lambda: command_id in self.responses, f"{method} timed out")
+
+        response = self.responses.pop(command_id)
+        if "error" in response:
+            raise DevToolsError(f"{method} failed: {response['error'].get('message')}")
+        return response.get("result", {})
+
+    def sleep(self, seconds: float) -> None:
+        """Waits while still delivering protocol events."""
+        deadline = time.monotonic() + seconds
+        self.wait(lambda: time.monotonic() >= deadline, "Connection closed", timeout=int(seconds * 1000) + COMMAND_TIMEOUT)
+
+    def wait(self, done: typing.Callable[[], bool], error: str, timeout: int = COMMAND_TIMEOUT) -> None:
+        deadline = time.monotonic() + timeout / 1000
+        timer = QTimer(self)
+        timer.timeout.connect(self.loop.quit)
+        timer.start(POLL_INTERVAL)
+        try:
+            while not done():
+                if self.closed or time.monotonic() > deadline:
+                    raise DevToolsError(error)
+                self.loop.exec()
+        finally:
+            timer.stop()
+            timer.deleteLater()
+
+    def record_cpu_profile(self, duration: float, sampling_interval: int = 100) -> dict:
+        """Samples the page's JavaScript for duration seconds; sampling_interval is in microseconds."""
+        self.send("Profiler.enable")
+        self.send("Profiler.setSamplingInterval", {"interval": sampling_interval})
+        self.send("Profiler.start")
+        self.sleep(duration)
+        profile = self.send("Profiler.stop")["profile"]
+        self.send("Profiler.disable")
+        return profile
+
+    def take_heap_snapshot(self, path: str) -> None:
+        """Streams a heap snapshot to path."""
+        with open(path, "w", encoding="utf-8") as file:
+            self.on_event("HeapProfiler.addHeapSnapshotChunk", lambda params: file.write(params.get("chunk", "")))
+            try:
+                self.send("HeapProfiler.enable")
+                self.send("HeapProfiler.takeHeapSnapshot", {"reportProgress": False})
+                self.send("HeapProfiler.disable")
+            finally:
+                self.listeners.pop("HeapProfiler.addHeapSnapshotChunk", None)
+
+    def performance_metrics(self) -> typing.Dict[str, float]:
+        self.send("Performance.enable")
+        metrics = self.send("Performance.getMetrics")["metrics"]
+        self.send("Performance.disable")
+        return {metric["name"]: metric["value"] for metric in metrics}
+
+
+def output_path(directory: str, target: dict, kind: str, extension: str) -> str:
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(directory, f"{kind}-{target['id'][:8]}-{stamp}{extension}")
+
+
+def record(session: DevToolsSession, target: dict, args: argparse.Namespace) -> str:
+    if args.command == "cpu-profile":
+        path = args.output or output_path(args.directory, target, "cpu", ".cpuprofile")
+        profile = session.record_cpu_profile(args.duration, args.sampling_interval)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(profile, file)
+    elif args.command == "heap-snapshot":
+        path = args.output or output_path(args.directory, target, "heap", ".heapsnapshot")
+        session.take_heap_snapshot(path)
+    else:
+        path = args.output or output_path(args.directory, target, "metrics", ".json")
+        metrics = session.performance_metrics()
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"url": target.get("url"), "timestamp": time.time(), "metrics": metrics}, file, indent=2)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Record CPU profiles, heap snapshots and metrics from Web4x Browser tabs.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Browser's --remote-debugging-port")
+    parser.add_argument("--tab", help="Target index, id, or URL/title substring (default: first tab)")
+    parser.add_argument("--directory", default=".", help="Where to write output files")
+    parser.add_argument("--output", help="Exact output file (single recording only)")
+    parser.add_argument("--repeat", type=int, default=1, help="Number of recordings to take")
+    parser.add_argument("--interval", type=float, default=60.0, help="Seconds between repeated recordings")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="List open tabs")
+    cpu_parser = subparsers.add_parser("cpu-profile", help="Record a .cpuprofile")
+    cpu_parser.add_argument("--duration", type=float, default=10.0, help="Seconds to record")
+    cpu_parser.add_argument("--sampling-interval", type=int, default=100, help="Microseconds between samples")
+    subparsers.add_parser("heap-snapshot", help="Take a .heapsnapshot")
+    subparsers.add_parser("metrics", help="Save Performance.getMetrics as JSON")
+    args = parser.parse_args()
+
+    if args.output and args.repeat > 1:
+        parser.error("--output cannot be combined with --repeat")
+
+    app = QCoreApplication(sys.argv[:1])
+    try:
+        targets = list_targets(args.port, args.host)
+        if args.command == "list":
+            for index, target in enumerate(targets):
+                print(f"{index}: {target.get('title', '')} - {target.get('url', '')}")
+            return
+
+        target = find_target(targets, args.tab)
+        session = DevToolsSession(target["webSocketDebuggerUrl"])
+        try:
+            for i in range(args.repeat):
+                if i > 0:
+                    session.sleep(args.interval)
+                print(record(session, target, args))
+        finally:
+            session.close()
+    except DevToolsError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
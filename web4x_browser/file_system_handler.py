@@ -1,6 +1,7 @@
 import os
 import sys
 from PyQt6.QtCore import QObject, pyqtSlot, pyqtSignal, QVariant, QThread
+import tracing
 
 class FileSystemHandler(QObject):
     fileCreated = pyqtSignal(str)
@@ -20,56 +21,84 @@ class FileSystemHandler(QObject):
     @pyqtSlot(str, str)
     def createFile(self, filePath, content):
         full_path = os.path.join(self.base_path, filePath)
-        try:
-            with open(full_path, 'w') as f:
-                f.write(content)
-            self.fileCreated.emit(filePath)
-        except Exception as e:
-            self.errorOccurred.emit(str(e))
+        with tracing.span("createFile", "file_io", at_level=tracing.DEBUG, path=filePath, bytes=len(content)):
+            try:
+                with open(full_path, 'w') as f:
+                    f.write(content)
+                self.fileCreated.emit(filePath)
+            except Exception as e:
+                self.errorOccurred.emit(str(e))
 
     @pyqtSlot(str)
     def createDirectory(self, dirPath):
         full_path = os.path.join(self.base_path, dirPath)
-        try:
-            os.makedirs(full_path, exist_ok=True)
-            self.directoryCreated.emit(dirPath)
-        except Exception as e:
-            self.errorOccurred.emit(str(e))
+        with tracing.span("createDirectory", "file_io", at_level=tracing.DEBUG, path=dirPath):
+            try:
+                os.makedirs(full_path, exist_ok=True)
+                self.directoryCreated.emit(dirPath)
+            except Exception as e:
+                self.errorOccurred.emit(str(e))
 
     @pyqtSlot(str, str)
     def changeFileContent(self, filePath, content):
         full_path = os.path.join(self.base_path, filePath)
-        try:
-            with open(full_path, 'w') as f:
-                f.write(content)
-            self.fileChanged.emit(filePath)
-        except Exception as e:
-            self.errorOccurred.emit(str(e))
+        with tracing.span("changeFileContent", "file_io", at_level=tracing.DEBUG, path=filePath, bytes=len(content)):
+            try:
+                with open(full_path, 'w') as f:
+                    f.write(content)
+                self.fileChanged.emit(filePath)
+            except Exception as e:
+                self.errorOccurred.emit(str(e))
 
     @pyqtSlot(str)
     def deleteFile(self, filePath):
         full_path = os.path.join(self.base_path, filePath)
-        try:
-            os.remove(full_path)
-            self.fileDeleted.emit(filePath)
-        except Exception as e:
-            self.errorOccurred.emit(str(e))
+        with tracing.span("deleteFile", "file_io", at_level=tracing.DEBUG, path=filePath):
+            try:
+                os.remove(full_path)
+                self.fileDeleted.emit(filePath)
+            except Exception as e:
+                self.errorOccurred.emit(str(e))
 
     @pyqtSlot(str)
     def deleteDirectory(self, dirPath):
         full_path = os.path.join(self.base_path, dirPath)
-        try:
-            os.rmdir(full_path)  # Only works for empty directories
-            self.directoryDeleted.emit(dirPath)
-        except Exception as e:
-            self.errorOccurred.emit(str(e))
+        with tracing.span("deleteDirectory", "file_io", at_level=tracing.DEBUG, path=dirPath):
+            try:
+                os.rmdir(full_path)  # Only works for empty directories
+                self.directoryDeleted.emit(dirPath)
+            except Exception as e:
+                self.errorOccurred.emit(str(e))
 
     @pyqtSlot(str)
     def readFile(self, filePath):
         full_path = os.path.join(self.base_path, filePath)
-        try:
-            with open(full_path, 'r') as f:
+        with tracing.span("readFile", "file_io", at_level=tracing.DEBUG, path=filePath) as trace:
+            try:
+                with open(full_path, 'r') as f:
+                    content = f.read()
+                trace.set("bytes", len(content))
+                self.fileRead.emit(filePath, content)
+            except Exception as e:
+                self.errorOccurred.emit(str(e))
+
+    def read_bytes(self, filePath: str) -> bytes:
+        """Reads a file as raw bytes for the bulk WebSocket transport. Errors propagate to the caller."""
+        full_path = os.path.join(self.base_path, filePath)
+        with tracing.span("readBytes", "file_io", at_level=tracing.DEBUG, path=filePath) as trace:
+            with open(full_path, 'rb') as f:
                 content = f.read()
-            self.fileRead.emit(filePath, content)
-        except Exception as e:
-            self.errorOccurred.emit(str(e))
+            trace.set("bytes", len(content))
+        return content
+
+    def write_bytes(self, filePath: str, content: bytes) -> None:
+        """Writes raw bytes for the bulk WebSocket transport. Errors propagate to the caller."""
+        full_path = os.path.join(self.base_path, filePath)
+        existed = os.path.exists(full_path)
+        with tracing.span("writeBytes", "file_io", at_level=tracing.DEBUG, path=filePath, bytes=len(content)):
+            with open(full_path, 'wb') as f:
+                f.write(content)
+        if existed:
+            self.fileChanged.emit(filePath)
+        else:
+            self.fileCreated.emit(filePath)
@@ -4,54 +4,245 @@
         window.qt = { webChannelTransport: null };
     }
 
+    // Tracer shared with page code as window.web4xTrace. Events are batched and
+    // handed to the Python trace buffer through the 'tracer' bridge object.
+    const traceConfig = window.__web4xTraceConfig || { level: 0, pid: 0 };
+    const NOOP = function() {};
+    const TRACE_INFO = 1;
+    const TRACE_DEBUG = 2;  // Per-call bridge and file I/O spans
+    const trace = window.web4xTrace = window.web4xTrace || {
+        level: 0,
+        pid: 0,
+        buffer: [],
+        flushTimer: null,
+
+        now() {
+            return Math.round((performance.timeOrigin + performance.now()) * 1000);
+        },
+
+        push(event) {
+            event.pid = this.pid;
+            event.tid = 1;
+            this.buffer.push(event);
+            if (this.flushTimer === null) {
+                this.flushTimer = setTimeout(() => this.flush(), 1000);
+            }
+        },
+
+        begin(name, args, level = TRACE_INFO) {
+            if (this.level < level) {
+                return NOOP;
+            }
+            const start = this.now();
+            return (extra) => {
+                this.push({
+                    name: name, cat: 'page', ph: 'X', ts: start, dur: this.now() - start,
+                    args: Object.assign({}, args, extra)
+                });
+            };
+        },
+
+        instant(name, args, level = TRACE_INFO) {
+            if (this.level >= level) {
+                this.push({ name: name, cat: 'page', ph: 'i', s: 't', ts: this.now(), args: args || {} });
+            }
+        },
+
+        flush() {
+            this.flushTimer = null;
+            if (!window.tracer || this.buffer.length === 0) {
+                return;
+            }
+            window.tracer.recordEvents(JSON.stringify(this.buffer));
+            this.buffer = [];
+        }
+    };
+    trace.level = traceConfig.level;
+    trace.pid = traceConfig.pid;
+
+    // The bridge token only grants access from this page, so keep it out of reach of later scripts
+    const bridgeConfig = window.__web4xBridge || null;
+    delete window.__web4xBridge;
+
+    // The bridge runs over qt.webChannelTransport unless the browser injected the
+    // address of its loopback WebSocket server. Text frames carry the QWebChannel
+    // protocol; binary frames are bulk requests answered through window.web4xBulk.
+    // When the socket cannot open (a CSP connect-src rule, or the server is down)
+    // the page falls back to qt.webChannelTransport without the bulk functions.
+    function openTransport(onReady) {
+        const config = bridgeConfig;
+        if (!config) {
+            onReady(qt.webChannelTransport);
+            return;
+        }
+
+        const SocketType = window.__web4xNativeWebSocket || WebSocket;
+        let socket;
+        try {
+            socket = new SocketType(config.url + '/?token=' + encodeURIComponent(config.token));
+        } catch (e) {
+            onReady(qt.webChannelTransport);
+            return;
+        }
+        socket.binaryType = 'arraybuffer';
+        const transport = { send: (data) => socket.send(data), onmessage: null };
+        const pending = new Map();
+        const encoder = new TextEncoder();
+        const decoder = new TextDecoder();
+        let nextId = 1;
+        let opened = false;
+
+        socket.onmessage = function(event) {
+            if (typeof event.data === 'string') {
+                transport.onmessage(event);
+                return;
+            }
+            const headerLength = new DataView(event.data).getUint32(0);
+            const header = JSON.parse(decoder.decode(new Uint8Array(event.data, 4, headerLength)));
+            const request = pending.get(header.id);
+            if (!request) {
+                return;
+            }
+            pending.delete(header.id);
+            if (header.ok) {
+                request.resolve(event.data.slice(4 + headerLength));
+            } else {
+                request.reject(new Error(header.error));
+            }
+        };
+
+        function installBulk() {
+            window.web4xBulk = {
+                request(method, args, payload) {
+                    let body = payload || new Uint8Array(0);
+                    if (typeof body === 'string') {
+                        body = encoder.encode(body);
+                    } else if (body instanceof ArrayBuffer) {
+                        body = new Uint8Array(body);
+                    } else if (ArrayBuffer.isView(body)) {
+                        body = new Uint8Array(body.buffer, body.byteOffset, body.byteLength);
+                    }
+                    const id = nextId++;
+                    const header = encoder.encode(JSON.stringify({ id: id, method: method, args: args || {} }));
+                    const frame = new Uint8Array(4 + header.length + body.length);
+                    new DataView(frame.buffer).setUint32(0, header.length);
+                    frame.set(header, 4);
+                    frame.set(body, 4 + header.length);
+                    return new Promise((resolve, reject) => {
+                        pending.set(id, { resolve: resolve, reject: reject });
+                        socket.send(frame);
+                    });
+                }
+            };
+
+            window.readFileBytes = function(filePath) {
+                return window.web4xBulk.request('readFile', { path: filePath });
+            };
+
+            window.writeFileBytes = function(filePath, data) {
+                return window.web4xBulk.request('writeFile', { path: filePath }, data);
+            };
+        }
+
+        socket.onopen = function() {
+            opened = true;
+            installBulk();
+            onReady(transport);
+        };
+        // An error is always followed by close, so close alone decides on the fallback
+        socket.onclose = function() {
+            if (!opened) {
+                onReady(qt.webChannelTransport);
+                return;
+            }
+            pending.forEach((request) => request.reject(new Error('Bridge connection closed')));
+            pending.clear();
+        };
+    }
+
     function initializeChannel() {
-        new QWebChannel(qt.webChannelTransport, function(channel) {
+        const endInit = trace.begin('QWebChannel init');
+        openTransport((transport) => new QWebChannel(transport, function(channel) {
+            window.web4xChannel = channel;
             window.fileSystemHandler = channel.objects.fileSystemHandler;
             window.codeExecutor = channel.objects.codeExecutor;
+            window.tracer = channel.objects.tracer;
             
             // Define and attach functions to window object immediately
             window.createFile = function(filePath, content) {
-                console.log('createFile called', filePath, content);
-                window.fileSystemHandler.createFile(filePath, content);
+                window.fileSystemHandler.createFile(filePath, content,
+                    trace.begin('createFile', { filePath: filePath, bytes: content.length }, TRACE_DEBUG));
                 return filePath;
             };
 
             window.createDirectory = function(dirPath) {
-                console.log('createDirectory called', dirPath);
-                window.fileSystemHandler.createDirectory(dirPath);
+                window.fileSystemHandler.createDirectory(dirPath, trace.begin('createDirectory', { dirPath: dirPath }, TRACE_DEBUG));
                 return dirPath;
             };
 
             window.changeFileContent = function(filePath, content) {
-                console.log('changeFileContent called', filePath, content);
-                window.fileSystemHandler.changeFileContent(filePath, content);
+                window.fileSystemHandler.changeFileContent(filePath, content,
+                    trace.begin('changeFileContent', { filePath: filePath, bytes: content.length }, TRACE_DEBUG));
                 return filePath;
             };
 
             window.deleteFile = function(filePath) {
-                console.log('deleteFile called', filePath);
-                window.fileSystemHandler.deleteFile(filePath);
+                window.fileSystemHandler.deleteFile(filePath, trace.begin('deleteFile', { filePath: filePath }, TRACE_DEBUG));
                 return filePath;
             };
 
             window.deleteDirectory = function(dirPath) {
-                console.log('deleteDirectory called', dirPath);
-                window.fileSystemHandler.deleteDirectory(dirPath);
+                window.fileSystemHandler.deleteDirectory(dirPath, trace.begin('deleteDirectory', { dirPath: dirPath }, TRACE_DEBUG));
                 return dirPath;
             };
 
             window.readFile = function(filePath) {
-                console.log('readFile called', filePath);
+                const endRead = trace.begin('readFile', { filePath: filePath }, TRACE_DEBUG);
                 return new Promise((resolve, reject) => {
                     window.readFileCallback = (content) => {
+                        endRead({ bytes: content ? content.length : 0 });
                         resolve(content);
                     };
                     window.fileSystemHandler.readFile(filePath);
                 });
             };
 
-            console.log('File system functions initialized and attached to window object');
-        });
+            // Runs a script in many tabs at once. Resolves with one result per tab;
+            // options.onResult receives each result as soon as its tab answers.
+            // Only pages from a trusted origin are given a token to call it with.
+            const fanOutToken = window.__web4xFanOutToken || null;
+            delete window.__web4xFanOutToken;
+            const fanOutJobs = new Map();
+            window.__web4xFanOutDeliver = function(jobId, kind, data) {
+                const job = fanOutJobs.get(jobId);
+                if (!job) {
+                    return;
+                }
+                if (kind === 'result') {
+                    if (job.onResult) {
+                        job.onResult(data);
+                    }
+                } else {
+                    fanOutJobs.delete(jobId);
+                    job.resolve(data);
+                }
+            };
+
+            window.runInTabs = function(script, options = {}) {
+                if (!fanOutToken || !channel.objects.scriptFanOut) {
+                    return Promise.reject(new Error('runInTabs is not available to this origin'));
+                }
+                const jobId = 'job-' + Date.now().toString(36) + '-' + Math.random().toString(36).slice(2);
+                return new Promise((resolve) => {
+                    fanOutJobs.set(jobId, { resolve: resolve, onResult: options.onResult });
+                    channel.objects.scriptFanOut.runScript(fanOutToken, jobId, script,
+                        options.tabs === undefined ? null : options.tabs, options.timeoutMs || 0);
+                });
+            };
+
+            endInit();
+            trace.flush();
+        }));
     }
 
     // Initialize as soon as possible
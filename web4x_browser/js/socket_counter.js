@@ -0,0 +1,21 @@
+// Count open WebSockets so the tab scheduler never freezes a live connection.
+// Installed as a QWebEngineScript at document creation, before any page script
+// runs, so sockets opened while the page loads are counted too.
+if (typeof WebSocket !== 'undefined' && !window.__web4xSocketTracking) {
+    window.__web4xSocketTracking = true;
+    window.__web4xOpenSockets = 0;
+    const NativeWebSocket = window.__web4xNativeWebSocket = window.WebSocket;
+    window.WebSocket = function(...args) {
+        const socket = new NativeWebSocket(...args);
+        window.__web4xOpenSockets++;
+        socket.addEventListener('close', () => { window.__web4xOpenSockets--; });
+        return socket;
+    };
+    window.WebSocket.prototype = NativeWebSocket.prototype;
+    Object.assign(window.WebSocket, {
+        CONNECTING: NativeWebSocket.CONNECTING,
+        OPEN: NativeWebSocket.OPEN,
+        CLOSING: NativeWebSocket.CLOSING,
+        CLOSED: NativeWebSocket.CLOSED
+    });
+}
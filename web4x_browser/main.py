@@ -1,3 +1,4 @@
+import argparse
 import sys
 import os
 from PyQt6.QtWidgets import QApplication
@@ -8,11 +9,24 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 # Determine if the script is run directly or imported as a module
 if __name__ == "__main__":
     from web4x_browser.browser import Browser, run_browser
+    from web4x_browser.devtools_client import enable_remote_debugging
 else:
     from .browser import Browser, run_browser
+    from .devtools_client import enable_remote_debugging
 
 def main():
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="Web4x Browser")
+    parser.add_argument(
+        "--remote-debugging-port",
+        type=int,
+        help="Serve the DevTools protocol on 127.0.0.1:PORT for web4x-devtools",
+    )
+    # Unknown arguments are left for Qt
+    args, qt_args = parser.parse_known_args()
+    if args.remote_debugging_port:
+        enable_remote_debugging(args.remote_debugging_port)
+
+    app = QApplication(sys.argv[:1] + qt_args)
     QApplication.setApplicationName("Web4x Browser")
     run_browser()
     sys.exit(app.exec())
@@ -0,0 +1,261 @@
+import json
+import secrets
+import time
+import typing
+import uuid
+from PyQt6.QtCore import QObject, QSettings, QTimer, QUrl, QVariant, pyqtSignal, pyqtSlot
+from PyQt6.QtWidgets import QTabWidget, QWidget
+import tracing
+
+# Constants
+SETTINGS_GROUP = "scriptFanOut"
+DEFAULT_TIMEOUT = 10000  # Milliseconds each tab has to answer
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+STATUS_TIMEOUT = "timeout"
+STATUS_CLOSED = "closed"
+
+# The script becomes the body of a function, so it must 'return' its value;
+# eval() is avoided because pages with a CSP lacking 'unsafe-eval' refuse it.
+# Exceptions become a result instead of a silent null.
+_WRAPPER = """
+(function() {{
+    try {{
+        return {{ ok: true, value: (function() {{
+{script}
+        }})() }};
+    }} catch (e) {{
+        return {{ ok: false, error: String(e) }};
+    }}
+}})();
+"""
+
+
+def origin_of(url: QUrl) -> str:
+    origin = f"{url.scheme()}://{url.host().lower()}"
+    return origin if url.port() == -1 else f"{origin}:{url.port()}"
+
+
+class FanOutPolicy:
+    """
+    Origins whose pages may call runInTabs. Read from the 'scriptFanOut' settings
+    group; with no trusted origins the feature is only available from Python.
+    """
+
+    def __init__(self, trusted_origins: typing.Optional[typing.List[str]] = None) -> None:
+        self.trusted_origins = {origin_of(QUrl(origin)) for origin in trusted_origins or []}
+
+    @classmethod
+    def from_settings(cls, settings: QSettings) -> "FanOutPolicy":
+        settings.beginGroup(SETTINGS_GROUP)
+        trusted_origins = settings.value("trustedOrigins", [])
+        if isinstance(trusted_origins, str):
+            trusted_origins = [trusted_origins]
+        settings.endGroup()
+        return cls([origin for origin in trusted_origins if isinstance(origin, str)])
+
+    def is_trusted(self, url: QUrl) -> bool:
+        return origin_of(url) in self.trusted_origins
+
+
+class FanOutJob(QObject):
+    """
+    One script dispatched to several tabs at once.
+
+    tabResult is emitted as each tab answers (or times out) and finished once
+    every tab is accounted for, with results in tab order.
+    """
+
+    tabResult = pyqtSignal(dict)
+    finished = pyqtSignal(list)
+
+    def __init__(
+        self,
+        job_id: str,
+        tabs: typing.List[QWidget],
+        indices: typing.List[int],
+        parent: typing.Optional[QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self.job_id = job_id
+        self.indices = indices  # Tab positions at dispatch time
+        self.started = time.monotonic()
+        self.results: typing.Dict[int, dict] = {}
+        self.pending: typing.Dict[int, QWidget] = dict(enumerate(tabs))
+        self.trace = tracing.span("fan_out", "script", job=job_id, tabs=len(tabs)).begin()
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.expire)
+
+    def record(self, slot: int, status: str, value: typing.Any = None, error: typing.Optional[str] = None) -> None:
+        tab = self.pending.pop(slot, None)
+        if tab is None:
+            return  # Answered after its deadline
+
+        result = {
+            "job": self.job_id,
+            "tab": self.indices[slot],
+            "url": tab.browser.url().toString() if status != STATUS_CLOSED else None,
+            "status": status,
+            "value": value,
+            "error": error,
+            "elapsedMs": round((time.monotonic() - self.started) * 1000, 1),
+        }
+        self.results[slot] = result
+        self.tabResult.emit(result)
+        if not self.pending:
+            self.finish()
+
+    def on_reply(self, slot: int, reply: typing.Any) -> None:
+        if isinstance(reply, dict) and reply.get("ok"):
+            self.record(slot, STATUS_OK, value=reply.get("value"))
+        elif isinstance(reply, dict):
+            self.record(slot, STATUS_ERROR, error=reply.get("error"))
+        else:
+            # runJavaScript answers None when the page could not run the script
+            self.record(slot, STATUS_ERROR, error="No result from page")
+
+    def tab_closed(self, tab: QWidget) -> None:
+        for slot, pending_tab in list(self.pending.items()):
+            if pending_tab is tab:
+                self.record(slot, STATUS_CLOSED)
+
+    def expire(self) -> None:
+        for slot in list(self.pending):
+            self.record(slot, STATUS_TIMEOUT, error="Timed out")
+
+    def finish(self) -> None:
+        self.timer.stop()
+        results = [self.results[slot] for slot in sorted(self.results)]
+        self.trace.set("timeouts", sum(1 for result in results if result["status"] == STATUS_TIMEOUT))
+        self.trace.finish()
+        self.finished.emit(results)
+
+
+class ScriptFanOut(QObject):
+    """
+    Runs one script in many tabs concurrently and collects the answers.
+
+    runJavaScript() is asynchronous, so dispatching to every tab up front means
+    the whole job takes as long as the slowest tab rather than the sum of all of
+    them. Registered on the web channel as 'scriptFanOut' so pages can start jobs
+    too. The channel is shared by every tab, so a page identifies itself with the
+    token injected into it; only pages from a trusted origin receive one, and
+    results are delivered to the calling page alone.
+    """
+
+    def __init__(
+        self,
+        tabs: QTabWidget,
+        policy: FanOutPolicy,
+        prepare_tab: typing.Optional[typing.Callable[[QWidget], None]] = None,
+        parent: typing.Optional[QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self.tabs = tabs
+        self.policy = policy
+        self.prepare_tab = prepare_tab
+        self.jobs: typing.Dict[str, FanOutJob] = {}
+        self.tab_tokens: typing.Dict[str, QWidget] = {}
+
+    def select_tabs(self, selector: typing.Any = None) -> typing.List[QWidget]:
+        """
+        Resolves a selector to browser tabs: None for all of them, a list of tab
+        indices, or a string matched against each tab's URL.
+        """
+        candidates = []
+        for i in range(self.tabs.count()):
+            widget = self.tabs.widget(i)
+            if hasattr(widget, "browser"):
+                candidates.append((i, widget))
+
+        if selector is None:
+            return [widget for _, widget in candidates]
+        if isinstance(selector, str):
+            return [widget for _, widget in candidates if selector in widget.browser.url().toString()]
+        if isinstance(selector, (list, tuple)):
+            indices = {int(index) for index in selector if isinstance(index, (int, float))}
+            return [widget for i, widget in candidates if i in indices]
+        return []
+
+    def run(
+        self,
+        script: str,
+        tabs: typing.Optional[typing.List[QWidget]] = None,
+        timeout: int = DEFAULT_TIMEOUT,
+        on_result: typing.Optional[typing.Callable[[dict], None]] = None,
+        on_finished: typing.Optional[typing.Callable[[list], None]] = None,
+        job_id: typing.Optional[str] = None,
+    ) -> FanOutJob:
+        """
+        Dispatches script to tabs (all browser tabs by default) and returns the
+        running job. The script is a function body, so it must 'return' its result.
+        """
+        tabs = self.select_tabs() if tabs is None else tabs
+        indices = [self.tabs.indexOf(tab) for tab in tabs]
+        job = FanOutJob(job_id or uuid.uuid4().hex, tabs, indices, self)
+        self.jobs[job.job_id] = job
+        if on_result:
+            job.tabResult.connect(on_result)
+        if on_finished:
+            job.finished.connect(on_finished)
+        job.finished.connect(lambda results, job_id=job.job_id: self.on_job_finished(job_id))
+
+        if not tabs:
+            job.finish()
+            return job
+
+        wrapped = _WRAPPER.format(script=script)
+        job.timer.start(timeout)
+        for slot, tab in enumerate(tabs):
+            if self.prepare_tab:
+                self.prepare_tab(tab)
+            tab.browser.page().runJavaScript(wrapped, lambda reply, slot=slot: job.on_reply(slot, reply))
+        return job
+
+    def page_token(self, tab: QWidget) -> typing.Optional[str]:
+        """Token to inject into the tab's current page, or None when its origin is not trusted."""
+        if not self.policy.is_trusted(tab.browser.url()):
+            return None
+        for token, token_tab in self.tab_tokens.items():
+            if token_tab is tab:
+                return token
+        token = secrets.token_urlsafe(32)
+        self.tab_tokens[token] = tab
+        return token
+
+    def tab_closed(self, tab: QWidget) -> None:
+        for job in list(self.jobs.values()):
+            job.tab_closed(tab)
+        for token, token_tab in list(self.tab_tokens.items()):
+            if token_tab is tab:
+                del self.tab_tokens[token]
+
+    def on_job_finished(self, job_id: str) -> None:
+        job = self.jobs.pop(job_id, None)
+        if job is not None:
+            job.deleteLater()
+
+    def deliver(self, tab: QWidget, origin: str, job_id: str, kind: str, payload: typing.Any) -> None:
+        """Hands a result to the page that started the job, unless it has since navigated away or closed."""
+        if tab not in self.tab_tokens.values() or origin_of(tab.browser.url()) != origin:
+            return
+        arguments = ", ".join(json.dumps(value, default=str) for value in (job_id, kind, payload))
+        tab.browser.page().runJavaScript(f"window.__web4xFanOutDeliver && window.__web4xFanOutDeliver({arguments});")
+
+    @pyqtSlot(str, str, str, QVariant, int)
+    def runScript(self, token: str, jobId: str, script: str, selector: QVariant, timeoutMs: int) -> None:
+        """Bridge entry point; jobId is chosen by the page so it can match the results delivered to it."""
+        tab = self.tab_tokens.get(token)
+        if tab is None or not self.policy.is_trusted(tab.browser.url()):
+            return
+        origin = origin_of(tab.browser.url())
+        self.run(
+            script,
+            self.select_tabs(selector),
+            timeoutMs if timeoutMs > 0 else DEFAULT_TIMEOUT,
+            on_result=lambda result: self.deliver(tab, origin, jobId, "result", result),
+            on_finished=lambda results: self.deliver(tab, origin, jobId, "finished", results),
+        )
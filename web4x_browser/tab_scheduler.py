@@ -0,0 +1,234 @@
+import os
+import time
+import typing
+from PyQt6.QtCore import QObject, QSettings, QTimer, QUrl, pyqtSignal, pyqtSlot
+from PyQt6.QtWidgets import QTabWidget, QWidget
+from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineScript
+
+# Constants
+SETTINGS_GROUP = "tabFreezing"
+DEFAULT_FREEZE_AFTER = 5 * 60  # Seconds a background tab may stay idle before freezing
+DEFAULT_SAMPLE_INTERVAL = 5000  # Milliseconds between CPU samples
+CPU_RATE_SMOOTHING = 0.3  # Weight of the newest sample in the running CPU average
+OPEN_SOCKETS_SCRIPT = "window.__web4xOpenSockets || 0"
+SOCKET_COUNTER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "js", "socket_counter.js")
+
+try:
+    _CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+except (AttributeError, ValueError, OSError):
+    _CLOCK_TICKS = 100
+
+
+def read_process_cpu(pid: int) -> typing.Optional[float]:
+    """Returns user + system CPU seconds consumed by pid, or None when /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/stat", "r") as file:
+            stat = file.read()
+    except OSError:
+        return None
+    # The command name may contain spaces, so split after its closing parenthesis
+    fields = stat.rsplit(")", 1)[-1].split()
+    try:
+        return (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+    except (IndexError, ValueError):
+        return None
+
+
+def create_socket_counter_script() -> QWebEngineScript:
+    """
+    Script counting the page's open WebSockets for keep_websockets. It runs at
+    document creation in the main world, before any page script can open a socket.
+    """
+    with open(SOCKET_COUNTER_PATH, "r") as file:
+        source = file.read()
+    script = QWebEngineScript()
+    script.setName("web4x-socket-counter")
+    script.setSourceCode(source)
+    script.setInjectionPoint(QWebEngineScript.InjectionPoint.DocumentCreation)
+    script.setWorldId(QWebEngineScript.ScriptWorldId.MainWorld)
+    return script
+
+
+class FreezePolicy:
+    """Decides which background tabs may be frozen. Read from the 'tabFreezing' settings group."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        freeze_after: float = DEFAULT_FREEZE_AFTER,
+        sample_interval: int = DEFAULT_SAMPLE_INTERVAL,
+        allowed_hosts: typing.Optional[typing.List[str]] = None,
+        keep_audible: bool = True,
+        keep_websockets: bool = True,
+    ) -> None:
+        self.enabled = enabled
+        self.freeze_after = freeze_after
+        self.sample_interval = sample_interval
+        self.allowed_hosts = allowed_hosts or []
+        self.keep_audible = keep_audible
+        self.keep_websockets = keep_websockets
+
+    @classmethod
+    def from_settings(cls, settings: QSettings) -> "FreezePolicy":
+        settings.beginGroup(SETTINGS_GROUP)
+        allowed_hosts = settings.value("allowedHosts", [])
+        if isinstance(allowed_hosts, str):
+            allowed_hosts = [allowed_hosts]
+        policy = cls(
+            enabled=settings.value("enabled", True, type=bool),
+            freeze_after=settings.value("freezeAfter", DEFAULT_FREEZE_AFTER, type=float),
+            sample_interval=settings.value("sampleInterval", DEFAULT_SAMPLE_INTERVAL, type=int),
+            allowed_hosts=[host for host in allowed_hosts if isinstance(host, str)],
+            keep_audible=settings.value("keepAudible", True, type=bool),
+            keep_websockets=settings.value("keepWebSockets", True, type=bool),
+        )
+        settings.endGroup()
+        return policy
+
+    def is_allowed(self, url: QUrl) -> bool:
+        """True when the URL's host is on the allow-list and must never be frozen."""
+        host = url.host().lower()
+        return any(host == allowed or host.endswith("." + allowed) for allowed in self.allowed_hosts)
+
+
+class TabActivity:
+    __slots__ = ("last_active", "cpu_rate", "frozen_rate", "frozen_since", "saved_seconds")
+
+    def __init__(self) -> None:
+        self.last_active = time.monotonic()
+        self.cpu_rate = 0.0  # Smoothed CPU seconds per second while running
+        self.frozen_rate = 0.0  # cpu_rate captured at the moment of freezing
+        self.frozen_since: typing.Optional[float] = None
+        self.saved_seconds = 0.0
+
+
+class TabScheduler(QObject):
+    """
+    Freezes idle background tabs and wakes them again when they are activated.
+
+    Each tick samples every renderer's CPU time from /proc, shares it between the
+    tabs hosted by that renderer and freezes background tabs that have been idle
+    longer than the policy allows. CPU saved is the pre-freeze rate minus the
+    rate measured while frozen, accumulated over each tick.
+    """
+
+    statsChanged = pyqtSignal(int, float)  # Frozen tab count, CPU seconds saved
+
+    def __init__(self, tabs: QTabWidget, policy: FreezePolicy, parent: typing.Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.tabs = tabs
+        self.policy = policy
+        self.activity: typing.Dict[QWidget, TabActivity] = {}
+        self.process_cpu: typing.Dict[int, float] = {}
+        self.last_sample = time.monotonic()
+        self.saved_seconds = 0.0  # Includes tabs that have since been closed
+
+        self.tabs.currentChanged.connect(self.on_current_changed)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.tick)
+        if self.policy.enabled:
+            self.timer.start(self.policy.sample_interval)
+
+    def register_tab(self, tab: QWidget) -> None:
+        self.activity[tab] = TabActivity()
+
+    def unregister_tab(self, tab: QWidget) -> None:
+        self.activity.pop(tab, None)
+
+    @pyqtSlot(int)
+    def on_current_changed(self, index: int) -> None:
+        tab = self.tabs.widget(index)
+        activity = self.activity.get(tab)
+        if activity is None:
+            return
+        activity.last_active = time.monotonic()
+        self.wake(tab)
+
+    def wake(self, tab: QWidget) -> None:
+        activity = self.activity[tab]
+        page = tab.browser.page()
+        if page.lifecycleState() != QWebEnginePage.LifecycleState.Active:
+            page.setLifecycleState(QWebEnginePage.LifecycleState.Active)
+        if activity.frozen_since is not None:
+            activity.frozen_since = None
+            self.emit_stats()
+
+    def freeze(self, tab: QWidget) -> None:
+        activity = self.activity.get(tab)
+        # The tab may have been closed or activated while the socket check ran
+        if activity is None or tab is self.tabs.currentWidget() or activity.frozen_since is not None:
+            return
+        tab.browser.page().setLifecycleState(QWebEnginePage.LifecycleState.Frozen)
+        activity.frozen_rate = activity.cpu_rate
+        activity.frozen_since = time.monotonic()
+        self.emit_stats()
+
+    @pyqtSlot()
+    def tick(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self.last_sample
+        self.last_sample = now
+        if elapsed <= 0:
+            return
+
+        self.sample_cpu(elapsed)
+
+        current = self.tabs.currentWidget()
+        for tab, activity in list(self.activity.items()):
+            if tab is current:
+                activity.last_active = now
+            elif activity.frozen_since is None and now - activity.last_active >= self.policy.freeze_after:
+                self.request_freeze(tab)
+        self.emit_stats()
+
+    def sample_cpu(self, elapsed: float) -> None:
+        tabs_by_pid: typing.Dict[int, typing.List[QWidget]] = {}
+        for tab in self.activity:
+            pid = tab.browser.page().renderProcessPid()
+            if pid > 0:
+                tabs_by_pid.setdefault(pid, []).append(tab)
+
+        process_cpu = {}
+        for pid, tabs in tabs_by_pid.items():
+            cpu = read_process_cpu(pid)
+            if cpu is None:
+                continue
+            process_cpu[pid] = cpu
+            previous = self.process_cpu.get(pid)
+            if previous is None:
+                continue
+            rate = max(0.0, cpu - previous) / elapsed / len(tabs)
+            for tab in tabs:
+                activity = self.activity[tab]
+                if activity.frozen_since is None:
+                    activity.cpu_rate += CPU_RATE_SMOOTHING * (rate - activity.cpu_rate)
+                else:
+                    saved = max(0.0, activity.frozen_rate - rate) * elapsed
+                    activity.saved_seconds += saved
+                    self.saved_seconds += saved
+        self.process_cpu = process_cpu
+
+    def request_freeze(self, tab: QWidget) -> None:
+        page = tab.browser.page()
+        if page.lifecycleState() != QWebEnginePage.LifecycleState.Active:
+            return
+        if self.policy.is_allowed(page.url()):
+            return
+        if self.policy.keep_audible and page.recentlyAudible():
+            return
+        if not self.policy.keep_websockets:
+            self.freeze(tab)
+            return
+
+        def on_socket_count(count: typing.Any) -> None:
+            if not count:
+                self.freeze(tab)
+
+        page.runJavaScript(OPEN_SOCKETS_SCRIPT, on_socket_count)
+
+    def frozen_count(self) -> int:
+        return sum(1 for activity in self.activity.values() if activity.frozen_since is not None)
+
+    def emit_stats(self) -> None:
+        self.statsChanged.emit(self.frozen_count(), self.saved_seconds)
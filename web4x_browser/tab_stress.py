@@ -0,0 +1,355 @@
+"""
+Tab-density stress benchmark for the Web4x Browser.
+
+Opens local fixture pages in a real Browser window under the offscreen platform
+at increasing tab counts. At each step it records total and per-renderer RSS,
+tab switch latency and GUI event-loop stalls. It then closes every tab and
+checks that the views are destroyed by deleteLater and their renderers exit.
+
+    python web4x_browser/tab_stress.py --steps 10 25 50 100 --json report.json
+
+Memory figures come from /proc and are only available on Linux.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import typing
+from PyQt6.QtCore import QCoreApplication, QEvent, QEventLoop, QObject, QSettings, Qt, QTimer, QUrl
+from PyQt6.QtWidgets import QApplication
+
+# Sibling modules are imported by name, as browser.py does
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Constants
+DEFAULT_STEPS = [5, 10, 25, 50]
+DEFAULT_SWITCHES = 50
+DEFAULT_FIXTURE_NODES = 2000
+HEARTBEAT_INTERVAL = 10  # Milliseconds between event-loop heartbeats
+LOAD_TIMEOUT = 120000
+SETTLE_TIME = 1000  # Milliseconds to let pages go idle before measuring
+RELEASE_TIMEOUT = 10000
+
+FIXTURE_HTML = """<!DOCTYPE html>
+<html>
+<head><title>Stress fixture</title></head>
+<body>
+<div id="ticker">0</div>
+<div id="nodes"></div>
+<script>
+    const nodes = document.getElementById('nodes');
+    for (let i = 0; i < %(nodes)d; i++) {
+        const node = document.createElement('div');
+        node.textContent = 'Row ' + i;
+        nodes.appendChild(node);
+    }
+    let ticks = 0;
+    setInterval(() => { document.getElementById('ticker').textContent = ++ticks; }, 100);
+</script>
+</body>
+</html>
+"""
+
+
+def read_rss(pid: int) -> typing.Optional[int]:
+    """Resident set size of pid in bytes, or None when /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/status", "r") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def descendant_pids(root: int) -> typing.List[int]:
+    """All processes below root, e.g. the QtWebEngineProcess renderers and GPU process."""
+    children: typing.Dict[int, typing.List[int]] = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return []
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as file:
+                parent = int(file.read().rsplit(")", 1)[-1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+
+    found = []
+    pending = [root]
+    while pending:
+        for child in children.get(pending.pop(), []):
+            found.append(child)
+            pending.append(child)
+    return found
+
+
+def percentile(values: typing.List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def megabytes(value: typing.Optional[int]) -> typing.Optional[float]:
+    return None if value is None else round(value / (1024 * 1024), 1)
+
+
+class EventLoopMonitor(QObject):
+    """Heartbeat timer; any lateness beyond its interval is time the GUI thread was blocked."""
+
+    def __init__(self, parent: typing.Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.stalls: typing.List[float] = []
+        self.last = time.perf_counter()
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.beat)
+
+    def start(self) -> None:
+        self.last = time.perf_counter()
+        self.timer.start(HEARTBEAT_INTERVAL)
+
+    def beat(self) -> None:
+        now = time.perf_counter()
+        self.stalls.append(max(0.0, (now - self.last) * 1000 - HEARTBEAT_INTERVAL))
+        self.last = now
+
+    def take(self) -> typing.List[float]:
+        stalls, self.stalls = self.stalls, []
+        return stalls
+
+
+class TabStress(QObject):
+    def __init__(self, browser: typing.Any, fixture_url: QUrl, switches: int) -> None:
+        super().__init__()
+        self.browser = browser
+        self.fixture_url = fixture_url
+        self.switches = switches
+        self.loop = QEventLoop(self)
+        self.monitor = EventLoopMonitor(self)
+        self.loaded = 0
+        self.opened = 0
+        self.destroyed_tabs = 0
+        self.destroyed_views = 0
+        self.renderer_pids: typing.Set[int] = set()
+
+    def spin(self, milliseconds: int) -> None:
+        QTimer.singleShot(milliseconds, self.loop.quit)
+        self.loop.exec()
+
+    def wait_until(self, done: typing.Callable[[], bool], timeout: int) -> bool:
+        deadline = time.monotonic() + timeout / 1000
+        while not done():
+            if time.monotonic() > deadline:
+                return False
+            self.spin(HEARTBEAT_INTERVAL)
+        return True
+
+    def release_deferred(self) -> None:
+        """Runs pending deleteLater() calls, which a nested event loop would otherwise postpone."""
+        QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+        self.spin(0)
+
+    def close_all_tabs(self) -> None:
+        while self.browser.tabs.count():
+            self.browser.close_tab(0)
+        self.release_deferred()
+
+    def open_tab(self) -> None:
+        self.browser.add_new_tab(self.fixture_url, "Stress")
+        tab = self.browser.tabs.currentWidget()
+        self.opened += 1
+        tab.browser.page().loadFinished.connect(self.on_loaded)
+        tab.destroyed.connect(self.on_tab_destroyed)
+        tab.browser.destroyed.connect(self.on_view_destroyed)
+
+    def on_loaded(self, ok: bool) -> None:
+        self.loaded += 1
+
+    def on_tab_destroyed(self, *args: typing.Any) -> None:
+        self.destroyed_tabs += 1
+
+    def on_view_destroyed(self, *args: typing.Any) -> None:
+        self.destroyed_views += 1
+
+    def memory(self) -> dict:
+        renderers = {}
+        for i in range(self.browser.tabs.count()):
+            widget = self.browser.tabs.widget(i)
+            if hasattr(widget, "browser"):
+                pid = widget.browser.page().renderProcessPid()
+                if pid > 0:
+                    renderers[pid] = read_rss(pid)
+        self.renderer_pids.update(renderers)
+
+        own = read_rss(os.getpid())
+        children = [read_rss(pid) for pid in descendant_pids(os.getpid())]
+        total = None if own is None else own + sum(rss for rss in children if rss)
+        renderer_values = [rss for rss in renderers.values() if rss]
+        return {
+            "browserRssMb": megabytes(own),
+            "totalRssMb": megabytes(total),
+            "renderers": len(renderers),
+            "rendererRssMb": sorted((megabytes(rss) for rss in renderer_values), reverse=True),
+            "rendererRssTotalMb": megabytes(sum(renderer_values)) if renderer_values else None,
+        }
+
+    def measure_switching(self) -> typing.List[float]:
+        """Time from setCurrentIndex() until the event loop is free again, in milliseconds."""
+        latencies = []
+        count = self.browser.tabs.count()
+        for _ in range(self.switches if count > 1 else 0):
+            index = random.choice([i for i in range(count) if i != self.browser.tabs.currentIndex()])
+            start = time.perf_counter()
+            # currentChanged runs update_url_bar and update_navigation_actions synchronously
+            self.browser.tabs.setCurrentIndex(index)
+            QTimer.singleShot(0, self.loop.quit)
+            self.loop.exec()
+            latencies.append((time.perf_counter() - start) * 1000)
+        return latencies
+
+    def run_step(self, target: int, baseline: dict) -> dict:
+        self.monitor.take()
+        start = time.perf_counter()
+        while self.browser.tabs.count() < target:
+            self.open_tab()
+        all_loaded = self.wait_until(lambda: self.loaded >= self.opened, LOAD_TIMEOUT)
+        load_seconds = time.perf_counter() - start
+        self.spin(SETTLE_TIME)
+        load_stalls = self.monitor.take()
+
+        memory = self.memory()
+        switch_latencies = self.measure_switching()
+        switch_stalls = self.monitor.take()
+
+        # Per-tab cost excludes the browser process and renderers already running with no tabs open
+        total_rss = memory["totalRssMb"]
+        baseline_rss = baseline["totalRssMb"]
+        rss_per_tab = None
+        if total_rss is not None and baseline_rss is not None:
+            rss_per_tab = round((total_rss - baseline_rss) / target, 1)
+        return {
+            "tabs": target,
+            "allLoaded": all_loaded,
+            "loadSeconds": round(load_seconds, 2),
+            **memory,
+            "rssPerTabMb": rss_per_tab,
+            "switchP50Ms": round(percentile(switch_latencies, 0.5), 2),
+            "switchP95Ms": round(percentile(switch_latencies, 0.95), 2),
+            "switchMaxMs": round(max(switch_latencies, default=0.0), 2),
+            "loadStallMaxMs": round(max(load_stalls, default=0.0), 1),
+            "switchStallP95Ms": round(percentile(switch_stalls, 0.95), 1),
+            "switchStallMaxMs": round(max(switch_stalls, default=0.0), 1),
+        }
+
+    def run_release(self) -> dict:
+        memory_before = self.memory()
+        closed = self.browser.tabs.count()
+        start = time.perf_counter()
+        self.close_all_tabs()
+        views_freed = self.wait_until(lambda: self.destroyed_views >= self.opened, RELEASE_TIMEOUT)
+        release_seconds = time.perf_counter() - start
+        renderers_exited = self.wait_until(
+            lambda: not any(os.path.exists(f"/proc/{pid}") for pid in self.renderer_pids), RELEASE_TIMEOUT
+        )
+        self.spin(SETTLE_TIME)
+        memory_after = self.memory()
+        return {
+            "closedTabs": closed,
+            "openedTabs": self.opened,
+            "destroyedTabs": self.destroyed_tabs,
+            "destroyedViews": self.destroyed_views,
+            "viewsFreed": views_freed,
+            "releaseSeconds": round(release_seconds, 2),
+            "renderersSeen": len(self.renderer_pids),
+            "renderersStillRunning": sum(1 for pid in self.renderer_pids if os.path.exists(f"/proc/{pid}")),
+            "renderersExited": renderers_exited,
+            "totalRssBeforeCloseMb": memory_before["totalRssMb"],
+            "totalRssAfterCloseMb": memory_after["totalRssMb"],
+        }
+
+    def run(self, steps: typing.List[int]) -> dict:
+        # Drop the restored or home tab so every step starts from fixture pages only
+        self.close_all_tabs()
+        self.monitor.start()
+        baseline = self.memory()
+        results = [self.run_step(target, baseline) for target in sorted(steps)]
+        release = self.run_release()
+        return {"baseline": baseline, "steps": results, "release": release}
+
+
+def print_report(report: dict) -> None:
+    def show(value: typing.Any) -> str:
+        return "n/a" if value is None else str(value)
+
+    print(f"Baseline total RSS: {show(report['baseline']['totalRssMb'])} MB")
+    print()
+    header = f"{'tabs':>6}{'total MB':>10}{'MB/tab':>8}{'rndrs':>7}{'rndr MB':>9}" \
+             f"{'sw p50':>8}{'sw p95':>8}{'stall p95':>11}{'stall max':>11}{'load s':>8}"
+    print(header)
+    for step in report["steps"]:
+        print(
+            f"{step['tabs']:>6}{show(step['totalRssMb']):>10}{show(step['rssPerTabMb']):>8}"
+            f"{step['renderers']:>7}{show(step['rendererRssTotalMb']):>9}"
+            f"{step['switchP50Ms']:>8}{step['switchP95Ms']:>8}"
+            f"{step['switchStallP95Ms']:>11}{step['switchStallMaxMs']:>11}{step['loadSeconds']:>8}"
+            + ("" if step["allLoaded"] else "  (not all pages loaded)")
+        )
+
+    release = report["release"]
+    print()
+    print(f"Closed {release['closedTabs']} tabs in {release['releaseSeconds']} s")
+    print(f"Views destroyed by deleteLater: {release['destroyedViews']}/{release['openedTabs']}"
+          + ("" if release["viewsFreed"] else "  (LEAK: some views were not destroyed)"))
+    print(f"Renderer processes still running: {release['renderersStillRunning']}/{release['renderersSeen']}")
+    print(f"Total RSS before/after closing: {show(release['totalRssBeforeCloseMb'])} / "
+          f"{show(release['totalRssAfterCloseMb'])} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure how the browser scales with open tabs.")
+    parser.add_argument("--steps", type=int, nargs="+", default=DEFAULT_STEPS, help="Tab counts to measure")
+    parser.add_argument("--switches", type=int, default=DEFAULT_SWITCHES, help="Tab switches timed per step")
+    parser.add_argument("--fixture-nodes", type=int, default=DEFAULT_FIXTURE_NODES, help="DOM rows per fixture page")
+    parser.add_argument("--json", help="Also write the report to this file")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the tab switch order")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    random.seed(args.seed)
+
+    with tempfile.TemporaryDirectory(prefix="web4x-stress-") as work_dir:
+        # Keep the run away from the user's saved tabs and settings
+        QSettings.setPath(QSettings.Format.NativeFormat, QSettings.Scope.UserScope, work_dir)
+        QSettings.setPath(QSettings.Format.IniFormat, QSettings.Scope.UserScope, work_dir)
+
+        fixture_path = os.path.join(work_dir, "fixture.html")
+        with open(fixture_path, "w", encoding="utf-8") as file:
+            file.write(FIXTURE_HTML % {"nodes": args.fixture_nodes})
+
+        app = QApplication(sys.argv[:1])
+        from browser import Browser
+
+        browser = Browser()
+        stress = TabStress(browser, QUrl.fromLocalFile(fixture_path), args.switches)
+        report = stress.run(args.steps)
+        browser.close()
+
+        print_report(report)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as file:
+                json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
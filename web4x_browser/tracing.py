@@ -0,0 +1,185 @@
+"""
+Structured tracing for the Web4x Browser.
+
+Spans and instant events are kept in an in-memory ring buffer and can be written
+out in the Chrome trace-event format (trace.json) for chrome://tracing or
+Perfetto. Events recorded by pages arrive through the TraceCollector bridge
+object and share the same timeline.
+
+Tracing is off unless WEB4X_TRACE is set to a level name. "info" records tab
+creation, script injection and script fan-out; "debug" adds a span for every
+bridge call and file operation. When off, span() returns a shared no-op object, so instrumented code pays one
+comparison per call.
+"""
+
+import json
+import os
+import threading
+import time
+import typing
+from collections import deque
+from PyQt6.QtCore import QObject, pyqtSlot
+
+# Constants
+OFF = 0
+INFO = 1  # Tab creation, injection and other coarse events
+DEBUG = 2  # Per-call bridge and file I/O spans
+LEVEL_NAMES = {"off": OFF, "info": INFO, "debug": DEBUG}
+DEFAULT_BUFFER_SIZE = 100000
+TRACE_ENV = "WEB4X_TRACE"
+TRACE_FILE_ENV = "WEB4X_TRACE_FILE"
+
+_PID = os.getpid()
+# Anchor the monotonic clock to the epoch so Python and page timestamps line up
+_EPOCH_OFFSET_US = time.time_ns() // 1000 - time.perf_counter_ns() // 1000
+
+_level = LEVEL_NAMES.get(os.environ.get(TRACE_ENV, "").lower(), OFF)
+_events: typing.Deque[dict] = deque(maxlen=DEFAULT_BUFFER_SIZE)
+
+
+def now_us() -> int:
+    """Microseconds since the epoch, from a monotonic clock."""
+    return time.perf_counter_ns() // 1000 + _EPOCH_OFFSET_US
+
+
+def level() -> int:
+    return _level
+
+
+def set_level(new_level: int) -> None:
+    global _level
+    _level = new_level
+
+
+def set_buffer_size(size: int) -> None:
+    global _events
+    _events = deque(_events, maxlen=size)
+
+
+def enabled(at_level: int = INFO) -> bool:
+    return _level >= at_level
+
+
+def clear() -> None:
+    _events.clear()
+
+
+class _Span:
+    __slots__ = ("name", "category", "args", "start")
+
+    def __init__(self, name: str, category: str, args: dict) -> None:
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0
+
+    def __enter__(self) -> "_Span":
+        return self.begin()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is not None:
+            self.args["error"] = repr(exc_value)
+        self.finish()
+
+    def begin(self) -> "_Span":
+        """Starts the span explicitly, for spans that end in a callback."""
+        self.start = now_us()
+        return self
+
+    def finish(self) -> None:
+        _events.append({
+            "name": self.name,
+            "cat": self.category,
+            "ph": "X",
+            "ts": self.start,
+            "dur": now_us() - self.start,
+            "pid": _PID,
+            "tid": threading.get_ident(),
+            "args": self.args,
+        })
+
+    def set(self, key: str, value: typing.Any) -> None:
+        """Attaches an argument once it is known, e.g. a result size."""
+        self.args[key] = value
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+    def begin(self) -> "_NullSpan":
+        return self
+
+    def finish(self) -> None:
+        pass
+
+    def set(self, key: str, value: typing.Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, category: str = "browser", at_level: int = INFO, **args: typing.Any) -> typing.Union[_Span, _NullSpan]:
+    """Context manager recording a complete ('X') event around its body."""
+    if _level < at_level:
+        return _NULL_SPAN
+    return _Span(name, category, args)
+
+
+def instant(name: str, category: str = "browser", at_level: int = INFO, **args: typing.Any) -> None:
+    if _level < at_level:
+        return
+    _events.append({
+        "name": name,
+        "cat": category,
+        "ph": "i",
+        "s": "t",
+        "ts": now_us(),
+        "pid": _PID,
+        "tid": threading.get_ident(),
+        "args": args,
+    })
+
+
+def add_events(events: typing.Iterable[dict]) -> None:
+    """Adds already formed trace events, e.g. those sent by a page."""
+    _events.extend(events)
+
+
+def dump(path: str) -> int:
+    """Writes the buffered events to path in Chrome trace format and returns how many were written."""
+    events = list(_events)
+    metadata = [{
+        "name": "process_name",
+        "ph": "M",
+        "pid": _PID,
+        "args": {"name": "Web4x Browser"},
+    }]
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, file)
+    return len(events)
+
+
+class TraceCollector(QObject):
+    """Bridge object through which injected page scripts submit their trace events."""
+
+    @pyqtSlot(result=int)
+    def level(self) -> int:
+        return _level
+
+    @pyqtSlot(str)
+    def recordEvents(self, payload: str) -> None:
+        if _level == OFF:
+            return
+        try:
+            events = json.loads(payload)
+        except ValueError:
+            return
+        if isinstance(events, list):
+            add_events(event for event in events if isinstance(event, dict))
@@ -0,0 +1,87 @@
+import typing
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QObject, QVariant, pyqtSlot
+from PyQt6.QtWidgets import QCompleter, QLineEdit
+from url_index import MAX_SUGGESTIONS, UrlIndex, normalize
+
+# Constants
+OPEN_TAB_LABEL = "Switch to tab"
+
+
+class UrlSuggestionModel(QAbstractListModel):
+    """List model holding the current suggestions; open tabs are listed first."""
+
+    def __init__(self, parent: typing.Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.suggestions: typing.List[typing.Tuple[str, str, bool]] = []
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.suggestions)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> typing.Any:
+        if not index.isValid() or index.row() >= len(self.suggestions):
+            return QVariant()
+        url, title, is_open = self.suggestions[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            label = f"{title} — {url}" if title else url
+            return f"{OPEN_TAB_LABEL}: {label}" if is_open else label
+        if role == Qt.ItemDataRole.EditRole:
+            return url
+        return QVariant()
+
+    def set_suggestions(self, suggestions: typing.List[typing.Tuple[str, str, bool]]) -> None:
+        self.beginResetModel()
+        self.suggestions = suggestions
+        self.endResetModel()
+
+
+class UrlCompleter(QCompleter):
+    """
+    Attaches a UrlIndex to a QLineEdit. Qt's own filtering is switched off and the
+    model is refilled from the index on every edit.
+    """
+
+    def __init__(
+        self,
+        url_index: UrlIndex,
+        open_tabs: typing.Callable[[], typing.List[typing.Tuple[str, str]]],
+        line_edit: QLineEdit,
+    ) -> None:
+        super().__init__(line_edit)
+        self.url_index = url_index
+        self.open_tabs = open_tabs
+        self.suggestion_model = UrlSuggestionModel(self)
+
+        self.setModel(self.suggestion_model)
+        self.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.setMaxVisibleItems(MAX_SUGGESTIONS)
+        self.setWidget(line_edit)
+
+        line_edit.textEdited.connect(self.update_suggestions)
+
+    @pyqtSlot(str)
+    def update_suggestions(self, text: str) -> None:
+        query = normalize(text)
+        suggestions: typing.List[typing.Tuple[str, str, bool]] = []
+        seen: typing.Set[str] = set()
+
+        if query:
+            for url, title in self.open_tabs():
+                if url in seen:
+                    continue
+                if normalize(url).startswith(query) or any(
+                    word.startswith(query) for word in title.lower().split()
+                ):
+                    suggestions.append((url, title, True))
+                    seen.add(url)
+
+            for entry in self.url_index.search(query, MAX_SUGGESTIONS):
+                if entry.url not in seen:
+                    suggestions.append((entry.url, entry.title, False))
+                    seen.add(entry.url)
+
+        self.suggestion_model.set_suggestions(suggestions[:MAX_SUGGESTIONS])
+        if suggestions:
+            self.complete()
+        else:
+            self.popup().hide()
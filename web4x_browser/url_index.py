@@ -0,0 +1,174 @@
+import math
+import time
+import typing
+
+# Constants
+FRECENCY_HALF_LIFE = 30 * 24 * 60 * 60  # Seconds for a visit to lose half its weight
+BUCKET_SIZE = 32  # Keys a leaf holds before it is split into child nodes
+TOP_PER_NODE = 16  # Best entries cached on every trie node
+MAX_SUGGESTIONS = 8
+
+_DECAY = math.log(2) / FRECENCY_HALF_LIFE
+_STRIPPED_PREFIXES = ("https://", "http://", "file://", "www.")
+
+
+def normalize(text: str) -> str:
+    """Lower-cases text and strips the scheme and 'www.' so 'git' matches 'https://www.github.com'."""
+    text = text.strip().lower()
+    for prefix in _STRIPPED_PREFIXES:
+        if text.startswith(prefix):
+            text = text[len(prefix):]
+    return text
+
+
+def _log_add(a: float, b: float) -> float:
+    if a == -math.inf:
+        return b
+    high, low = (a, b) if a > b else (b, a)
+    return high + math.log1p(math.exp(low - high))
+
+
+class UrlEntry:
+    __slots__ = ("url", "title", "score", "visits", "keys")
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.title = ""
+        # Frecency is kept as log(sum(weight * exp(decay * visit_time))). Decay
+        # applies equally to every entry, so the ordering never changes as the
+        # clock moves and scores only ever grow when a visit is recorded.
+        self.score = -math.inf
+        self.visits = 0
+        self.keys: typing.Set[str] = set()
+
+    def frecency(self, now: typing.Optional[float] = None) -> float:
+        """Returns the decayed visit weight as of now."""
+        if self.score == -math.inf:
+            return 0.0
+        now = time.time() if now is None else now
+        return math.exp(self.score - _DECAY * now)
+
+
+class _TrieNode:
+    __slots__ = ("children", "top", "bucket")
+
+    def __init__(self) -> None:
+        self.children: typing.Optional[typing.Dict[str, "_TrieNode"]] = None
+        self.top: typing.List[UrlEntry] = []
+        # (key, entry) pairs below this node while it is still a leaf
+        self.bucket: typing.Set[typing.Tuple[str, UrlEntry]] = set()
+
+
+class UrlIndex:
+    """
+    Incrementally maintained prefix index over visited URLs and page titles.
+
+    A burst trie: leaves hold up to BUCKET_SIZE keys and split into child nodes
+    when they overflow, so long shared prefixes such as a host name never end in
+    a large bucket. Every node caches its TOP_PER_NODE best entries by frecency.
+    A lookup walks at most len(query) nodes and then either slices that cache or
+    filters one small bucket. Because scores only grow, recording a visit touches
+    just the nodes on that entry's key paths.
+    """
+
+    def __init__(self) -> None:
+        self.root = _TrieNode()
+        self.entries: typing.Dict[str, UrlEntry] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def record_visit(self, url: str, weight: float = 1.0, timestamp: typing.Optional[float] = None) -> None:
+        if not url:
+            return
+        entry = self.entries.get(url)
+        if entry is None:
+            entry = UrlEntry(url)
+            self.entries[url] = entry
+        timestamp = time.time() if timestamp is None else timestamp
+        entry.score = _log_add(entry.score, math.log(weight) + _DECAY * timestamp)
+        entry.visits += 1
+        self._index_keys(entry, self._keys_for(entry))
+
+    def set_title(self, url: str, title: str) -> None:
+        entry = self.entries.get(url)
+        if entry is None or entry.title == title:
+            return
+        entry.title = title
+        # Keys from an old title are kept; they still point at the right URL.
+        self._index_keys(entry, self._keys_for(entry))
+
+    def search(self, query: str, limit: int = MAX_SUGGESTIONS) -> typing.List[UrlEntry]:
+        query = normalize(query)
+        if not query:
+            return []
+
+        node = self.root
+        for char in query:
+            if node.children is None:
+                return self._search_bucket(node, query, limit)
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return node.top[:limit]
+
+    @staticmethod
+    def _search_bucket(node: _TrieNode, query: str, limit: int) -> typing.List[UrlEntry]:
+        matches = {entry for key, entry in node.bucket if key.startswith(query)}
+        return sorted(matches, key=lambda entry: entry.score, reverse=True)[:limit]
+
+    def _keys_for(self, entry: UrlEntry) -> typing.Set[str]:
+        keys = {normalize(entry.url)}
+        for word in entry.title.lower().split():
+            keys.add(word)
+        keys.discard("")
+        return keys
+
+    def _index_keys(self, entry: UrlEntry, keys: typing.Set[str]) -> None:
+        visited: typing.Set[int] = set()
+        for key in keys | entry.keys:
+            node = self.root
+            depth = 0
+            while True:
+                if id(node) not in visited:
+                    visited.add(id(node))
+                    self._promote(node, entry)
+                if node.children is None:
+                    node.bucket.add((key, entry))
+                    if len(node.bucket) > BUCKET_SIZE:
+                        self._split(node, depth)
+                    break
+                if depth == len(key):
+                    break
+                node = node.children.setdefault(key[depth], _TrieNode())
+                depth += 1
+        entry.keys |= keys
+
+    def _split(self, node: _TrieNode, depth: int) -> None:
+        """Turns an overflowing leaf into an inner node; keys ending here live on in the top caches above."""
+        node.children = {}
+        for key, entry in node.bucket:
+            if len(key) > depth:
+                child = node.children.setdefault(key[depth], _TrieNode())
+                child.bucket.add((key, entry))
+        node.bucket = set()
+
+        for child in node.children.values():
+            entries = {entry for _, entry in child.bucket}
+            child.top = sorted(entries, key=lambda entry: entry.score, reverse=True)[:TOP_PER_NODE]
+            if len(child.bucket) > BUCKET_SIZE:
+                self._split(child, depth + 1)
+
+    @staticmethod
+    def _promote(node: _TrieNode, entry: UrlEntry) -> None:
+        top = node.top
+        if entry in top:
+            top.remove(entry)
+        elif len(top) >= TOP_PER_NODE and top[-1].score >= entry.score:
+            return
+        # Insertion into a short list is cheaper than a heap at this size
+        position = len(top)
+        while position > 0 and top[position - 1].score < entry.score:
+            position -= 1
+        top.insert(position, entry)
+        del top[TOP_PER_NODE:]
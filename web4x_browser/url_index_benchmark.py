@@ -0,0 +1,102 @@
+"""
+Lookup latency benchmark for the URL bar autocomplete index.
+
+Loads a large synthetic history, including many URLs that share a long host
+prefix, and times prefix lookups of every length. Results are checked against a
+brute-force scan of the same history. Exits with status 1 when the p99 lookup
+time reaches the budget or a lookup disagrees with the scan.
+
+    python web4x_browser/url_index_benchmark.py --entries 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Sibling modules are imported by name, as browser.py does
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from url_index import MAX_SUGGESTIONS, UrlIndex, normalize
+
+# Constants
+DEFAULT_ENTRIES = 100000
+DEFAULT_QUERIES = 2000
+BUDGET_MS = 1.0
+START_TIME = 1.7e9
+
+
+def build_history(count: int, rng: random.Random) -> list:
+    """Half the URLs share 'github.com/', the rest are spread over many hosts."""
+    words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9))) for _ in range(3000)]
+    urls = []
+    for i in range(count):
+        if i % 2:
+            urls.append(f"https://github.com/org{i % 500}/repo{i}")
+        else:
+            urls.append(f"https://www.{rng.choice(words)}.com/{rng.choice(words)}/{i}")
+    return urls
+
+
+def brute_force(index: UrlIndex, query: str) -> list:
+    query = normalize(query)
+    matches = [entry for entry in index.entries.values() if any(key.startswith(query) for key in entry.keys)]
+    matches.sort(key=lambda entry: entry.score, reverse=True)
+    return matches[:MAX_SUGGESTIONS]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time UrlIndex lookups over a large history.")
+    parser.add_argument("--entries", type=int, default=DEFAULT_ENTRIES, help="URLs to index")
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERIES, help="Lookups to time")
+    parser.add_argument("--verify", type=int, default=50, help="Lookups to check against a brute-force scan")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    urls = build_history(args.entries, rng)
+    index = UrlIndex()
+    start = time.perf_counter()
+    for i, url in enumerate(urls):
+        index.record_visit(url, timestamp=START_TIME + rng.random() * 1e7)
+        if i % 3 == 0:
+            index.set_title(url, f"Page {i} about {url.rsplit('/', 2)[-2]}")
+    # Revisits raise scores, which must reorder the cached top entries
+    for url in rng.sample(urls, len(urls) // 5):
+        index.record_visit(url, timestamp=START_TIME + 1e7 + rng.random() * 1e7)
+    print(f"Indexed {len(index)} URLs in {time.perf_counter() - start:.1f} s")
+
+    fixed = ["github.com", "github.com/", "github.com/org1", "github.com/org42/repo", "github.com/org42/repo4"]
+    queries = fixed + [
+        normalize(url)[:rng.randint(1, len(normalize(url)))] for url in rng.sample(urls, args.queries)
+    ]
+
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    for query, timing in zip(fixed, timings):
+        print(f"{query!r:<28}{timing:.4f} ms")
+    ordered = sorted(timings)
+    p99 = ordered[int(0.99 * (len(ordered) - 1))]
+    long_timings = [timing for query, timing in zip(queries, timings) if len(query) > 10]
+    print(f"{len(queries)} lookups: mean {sum(timings) / len(timings):.4f} ms, p99 {p99:.4f} ms, max {ordered[-1]:.4f} ms")
+    print(f"{len(long_timings)} lookups longer than 10 characters: max {max(long_timings, default=0.0):.4f} ms")
+
+    mismatches = 0
+    for query in fixed + rng.sample(queries, min(args.verify, len(queries))):
+        found = [entry.score for entry in index.search(query)]
+        # Compare scores rather than URLs, since entries tied on score may be picked in either order
+        if found != [entry.score for entry in brute_force(index, query)]:
+            mismatches += 1
+            print(f"Mismatch for {query!r}")
+    print(f"Checked against a brute-force scan: {mismatches} mismatches")
+
+    if p99 >= BUDGET_MS or mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import json
+import secrets
+import struct
+import typing
+from PyQt6.QtCore import QByteArray, QJsonValue, QObject, QUrl, QUrlQuery, pyqtSlot
+from PyQt6.QtNetwork import QHostAddress
+from PyQt6.QtWebChannel import QWebChannel, QWebChannelAbstractTransport
+from PyQt6.QtWebSockets import QWebSocket, QWebSocketProtocol, QWebSocketServer
+import tracing
+
+# Constants
+SETTINGS_GROUP = "bridge"
+TRANSPORT_QWEBCHANNEL = "qwebchannel"
+TRANSPORT_WEBSOCKET = "websocket"
+SERVER_NAME = "Web4x Bridge"
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Binary frames: 4-byte big-endian header length, UTF-8 JSON header, raw payload
+_HEADER_LENGTH = struct.Struct(">I")
+
+BulkHandler = typing.Callable[[typing.Dict[str, typing.Any], bytes], typing.Optional[bytes]]
+
+
+def web_origin(url: QUrl) -> str:
+    """Serializes the origin of url the way a page sends it in the WebSocket Origin header."""
+    scheme = url.scheme()
+    if scheme not in _DEFAULT_PORTS:
+        return "null"  # Opaque origins such as file: and data:
+    origin = f"{scheme}://{url.host().lower()}"
+    port = url.port()
+    return origin if port in (-1, _DEFAULT_PORTS[scheme]) else f"{origin}:{port}"
+
+
+def encode_frame(header: typing.Dict[str, typing.Any], payload: bytes = b"") -> bytes:
+    header_bytes = json.dumps(header).encode("utf-8")
+    return _HEADER_LENGTH.pack(len(header_bytes)) + header_bytes + payload
+
+
+def decode_frame(frame: bytes) -> typing.Tuple[typing.Dict[str, typing.Any], bytes]:
+    """Splits a binary frame into its header and payload. Raises ValueError on malformed frames."""
+    if len(frame) < _HEADER_LENGTH.size:
+        raise ValueError("Frame too short")
+    (header_length,) = _HEADER_LENGTH.unpack_from(frame)
+    header_end = _HEADER_LENGTH.size + header_length
+    if header_end > len(frame):
+        raise ValueError("Frame header exceeds frame length")
+    header = json.loads(frame[_HEADER_LENGTH.size:header_end].decode("utf-8"))
+    if not isinstance(header, dict):
+        raise ValueError("Frame header is not an object")
+    return header, frame[header_end:]
+
+
+class WebSocketTransport(QWebChannelAbstractTransport):
+    """Carries QWebChannel JSON messages over text frames of a single QWebSocket."""
+
+    def __init__(self, socket: QWebSocket, parent: typing.Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.socket = socket
+        self.socket.textMessageReceived.connect(self.on_text_message)
+
+    def sendMessage(self, message: typing.Dict[str, QJsonValue]) -> None:
+        payload = {key: value.toVariant() for key, value in message.items()}
+        self.socket.sendTextMessage(json.dumps(payload))
+
+    @pyqtSlot(str)
+    def on_text_message(self, text: str) -> None:
+        try:
+            message = json.loads(text)
+        except ValueError:
+            return
+        if isinstance(message, dict):
+            self.messageReceived.emit({key: QJsonValue.fromVariant(value) for key, value in message.items()}, self)
+
+
+class WebSocketBridgeServer(QObject):
+    """
+    Loopback WebSocket server exposing a QWebChannel as an alternative to
+    qt.webChannelTransport.
+
+    Each page is issued its own single-use token by client_config(), bound to the
+    page's origin. Clients must connect with it in the 'token' query item, from
+    that origin; any other handshake is closed.
+    Text frames carry the regular QWebChannel protocol, so every object registered
+    on the channel is available unchanged. Binary frames are bulk requests that are
+    dispatched to handlers registered with register_bulk_handler(), which lets large
+    payloads skip JSON encoding entirely.
+    """
+
+    def __init__(self, channel: QWebChannel, parent: typing.Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.channel = channel
+        self.client_tokens: typing.Dict[str, typing.Tuple[QObject, str]] = {}  # Token to its owner and origin
+        self.owner_tokens: typing.Dict[QObject, str] = {}
+        self.bulk_handlers: typing.Dict[str, BulkHandler] = {}
+        self.transports: typing.Dict[QWebSocket, WebSocketTransport] = {}
+
+        self.server = QWebSocketServer(SERVER_NAME, QWebSocketServer.SslMode.NonSecureMode, self)
+        self.server.newConnection.connect(self.on_new_connection)
+
+    def listen(self, port: int = 0) -> bool:
+        """Listens on localhost only. Port 0 picks a free port."""
+        return self.server.listen(QHostAddress(QHostAddress.SpecialAddress.LocalHost), port)
+
+    def url(self) -> str:
+        return f"ws://127.0.0.1:{self.server.serverPort()}"
+
+    def client_config(self, owner: QObject, page_url: QUrl) -> str:
+        """
+        JavaScript object literal telling a page's injected scripts how to reach the
+        server. Issuing a new config revokes the owner's earlier, unused token.
+        """
+        self.revoke(owner)
+        token = secrets.token_urlsafe(32)
+        self.client_tokens[token] = (owner, web_origin(page_url))
+        self.owner_tokens[owner] = token
+        return json.dumps({"url": self.url(), "token": token})
+
+    def revoke(self, owner: QObject) -> None:
+        token = self.owner_tokens.pop(owner, None)
+        if token is not None:
+            self.client_tokens.pop(token, None)
+
+    def register_bulk_handler(self, method: str, handler: BulkHandler) -> None:
+        self.bulk_handlers[method] = handler
+
+    def close(self) -> None:
+        for socket in list(self.transports):
+            socket.close()
+        self.server.close()
+
+    @pyqtSlot()
+    def on_new_connection(self) -> None:
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            token = QUrlQuery(socket.requestUrl()).queryItemValue("token")
+            owner, origin = self.client_tokens.pop(token, (None, None))
+            self.owner_tokens.pop(owner, None)
+            if origin is None or socket.origin() != origin:
+                socket.close(QWebSocketProtocol.CloseCode.CloseCodePolicyViolated, "Invalid token or origin")
+                socket.deleteLater()
+                continue
+
+            transport = WebSocketTransport(socket, self)
+            self.transports[socket] = transport
+            socket.binaryMessageReceived.connect(lambda data, socket=socket: self.on_binary_message(socket, data))
+            socket.disconnected.connect(lambda socket=socket: self.on_disconnected(socket))
+            self.channel.connectTo(transport)
+
+    def on_disconnected(self, socket: QWebSocket) -> None:
+        transport = self.transports.pop(socket, None)
+        if transport is not None:
+            self.channel.disconnectFrom(transport)
+            transport.deleteLater()
+        socket.deleteLater()
+
+    def on_binary_message(self, socket: QWebSocket, data: QByteArray) -> None:
+        try:
+            header, payload = decode_frame(bytes(data))
+        except ValueError:
+            return
+
+        request_id = header.get("id")
+        method = header.get("method")
+        handler = self.bulk_handlers.get(method)
+        with tracing.span("bulk " + str(method), "bridge", at_level=tracing.DEBUG, bytes=len(payload)) as trace:
+            if handler is None:
+                reply = encode_frame({"id": request_id, "ok": False, "error": f"Unknown method: {method}"})
+            else:
+                try:
+                    result = handler(header.get("args") or {}, payload) or b""
+                    reply = encode_frame({"id": request_id, "ok": True}, result)
+                except Exception as e:
+                    reply = encode_frame({"id": request_id, "ok": False, "error": str(e)})
+            trace.set("reply_bytes", len(reply))
+        socket.sendBinaryMessage(QByteArray(reply))